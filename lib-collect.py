@@ -25,54 +25,295 @@
    - Track installations with logging
 """
 
+import argparse
 import subprocess
 import os
 import sys
+import json
 import logging
-from typing import Dict, List, Set
+import multiprocessing
+import shutil
+import hashlib
+import time
+import threading
+import tempfile
+import sysconfig
+from functools import lru_cache, partial
+from importlib.metadata import PackageNotFoundError, distributions, version
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
 from datetime import datetime
 
+# Wheel-only installs never invoke a compiler/build backend
+# (uv has no --prefer-binary; --only-binary alone gives the same guarantee)
+BINARY_ONLY_FLAGS = ("--only-binary=:all:", "--prefer-binary")
+UV_BINARY_ONLY_FLAGS = ("--only-binary=:all:",)
+
+# How pip and uv report that a package has no usable wheel
+NO_WHEEL_MARKERS = ("No matching distribution", "no usable wheels")
+
+# Installs still running after this many seconds are treated as hung
+INSTALL_TIMEOUT = 1800
+
+def _run_streamed(argv: Sequence[str], timeout: int = INSTALL_TIMEOUT) -> subprocess.CompletedProcess:
+    """
+    🔵 Streamed Subprocess:
+    - Sends each output line (stdout and stderr) to logging as it arrives
+    - Kills the process if it runs longer than timeout seconds
+    - Returns the combined output in CompletedProcess.stdout
+    """
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            bufsize=1, text=True)
+    lines = []
+
+    def pump():
+        for line in proc.stdout:
+            lines.append(line)
+            logging.info(line.rstrip())
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    try:
+        proc.wait(timeout=timeout)
+        reader.join()
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        logging.error(f"Timed out after {timeout}s: {' '.join(argv)}")
+        # Grandchildren (e.g. build backends) may still hold the pipe open
+        reader.join(timeout=5)
+    return subprocess.CompletedProcess(argv, proc.returncode, stdout="".join(lines))
+
+def _run_pip(pip_command: Sequence[str], args: Sequence[str],
+             capture_output: bool = False) -> subprocess.CompletedProcess:
+    """
+    Run an install command built by pip_command(), retrying without its
+    wheel-only flags when a package has no matching wheel. Output is
+    streamed to logging unless capture_output is set, in which case
+    stdout and stderr are returned separately.
+    """
+    def run(command):
+        if not capture_output:
+            return _run_streamed(command)
+        try:
+            return subprocess.run(command, capture_output=True, text=True,
+                                  timeout=INSTALL_TIMEOUT)
+        except subprocess.TimeoutExpired as e:
+            # subprocess.run has already killed the process
+            logging.error(f"Timed out after {INSTALL_TIMEOUT}s: {' '.join(command)}")
+            stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
+            return subprocess.CompletedProcess(command, -9, stdout=stdout,
+                                               stderr=f"Timed out after {INSTALL_TIMEOUT}s")
+
+    result = run([*pip_command, *args])
+    output = result.stderr if capture_output else result.stdout
+    if result.returncode != 0 and any(m in output for m in NO_WHEEL_MARKERS):
+        logging.warning(f"No wheel available for {' '.join(args)}, retrying with source builds allowed")
+        source_command = [arg for arg in pip_command if arg not in BINARY_ONLY_FLAGS]
+        result = run([*source_command, *args])
+    return result
+
+def _download_one(lib: str, download_command: Sequence[str], wheel_dir: str) -> Tuple[str, int, str]:
+    """
+    Fetch a library's wheels into its own wheel_dir/<lib> folder; module-level
+    so worker processes can pickle it. Only downloads run in parallel, so
+    no two processes ever write to site-packages at the same time.
+    """
+    result = _run_pip(download_command, ["--dest", os.path.join(wheel_dir, lib), lib],
+                      capture_output=True)
+    return lib, result.returncode, result.stderr
+
+def _already_installed(lib: str) -> bool:
+    """Whether a distribution is installed, checked locally without contacting PyPI."""
+    try:
+        version(lib)
+        return True
+    except PackageNotFoundError:
+        return False
+
+def _pip_fetch_flags() -> Tuple[str, ...]:
+    """
+    pip older than 22.3 cannot read PEP 658 metadata files, so ask it to
+    lazily fetch wheel metadata (fast-deps) instead of whole wheels during
+    resolution. The feature first shipped in pip 20.3; newer pip does this
+    by default and later releases drop the flag, so nothing is added
+    outside that window.
+    """
+    try:
+        major, minor = (int(part) for part in version("pip").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return ()
+    return ("--use-feature=fast-deps",) if (20, 3) <= (major, minor) < (22, 3) else ()
+
+# Cached resolutions older than this are re-resolved against the index
+RESOLUTION_MAX_AGE = 30 * 24 * 60 * 60
+
+def _environment_tag() -> str:
+    """Platform and interpreter a resolution or lock is only valid for, e.g. linux-x86_64-py3.11."""
+    return f"{sysconfig.get_platform()}-py{sys.version_info[0]}.{sys.version_info[1]}"
+
+def _installed_snapshot() -> List[str]:
+    """Sorted name==version of every installed distribution (local metadata only)."""
+    return sorted({f"{dist.metadata['Name']}=={dist.version}".lower()
+                   for dist in distributions() if dist.metadata['Name']})
+
+def _resolution_key(selected: Set[str], backend: str) -> str:
+    """
+    Key for a selection's cached resolution. Resolutions are made against
+    the current environment, so the key covers the interpreter, platform,
+    installer backend and every installed distribution, not just the names.
+    """
+    parts = [*sorted(selected), _environment_tag(), backend, *_installed_snapshot()]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def _pins(resolved: List[dict]) -> List[str]:
+    """name==version requirements for every distribution in a dry-run report."""
+    return [f"{item['metadata']['name']}=={item['metadata']['version']}" for item in resolved]
+
+def _write_atomic(path: str, text: str):
+    """Write via a temp file and os.replace so concurrent runs never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def _parse_mb(size: str) -> int:
+    """Convert a display size such as "~2GB" or "~50MB" to megabytes."""
+    size = size.lower().lstrip('~')
+    if size.endswith('gb'):
+        return int(float(size[:-2]) * 1024)
+    return int(float(size[:-2]))
+
+def _format_mb(total_mb: int) -> str:
+    """Format a megabyte total the same way the library sizes are written."""
+    if total_mb > 1024:
+        return f"~{total_mb/1024:.1f}GB"
+    return f"~{total_mb:.0f}MB"
+
+@lru_cache(maxsize=None)
+def _category_size(category_mb: Tuple[int, ...]) -> str:
+    """Formatted category total, computed once per category for all menu redraws."""
+    return _format_mb(sum(category_mb))
+
+# category -> name -> (size, description); read-only and shared by every manager
+_LIBRARIES: Mapping[str, Mapping[str, Tuple[str, str]]] = MappingProxyType({
+    "1_core_frameworks": MappingProxyType({
+        "tensorflow": ("~2GB", "→ Google's deep learning framework"),
+        "torch": ("~4GB", "→ Facebook's PyTorch for research & production"),
+        "scikit-learn": ("~300MB", "→ Traditional ML algorithms & tools"),
+        "keras": ("~100MB", "→ High-level neural network API"),
+        "jax": ("~600MB", "→ Automatic differentiation & XLA"),
+        "xgboost": ("~200MB", "→ Gradient boosting framework"),
+    }),
+    "2_visualization": MappingProxyType({
+        "matplotlib": ("~50MB", "→ Basic plotting library"),
+        "plotly": ("~100MB", "→ Interactive visualization"),
+        "seaborn": ("~20MB", "→ Statistical data visualization"),
+        "bokeh": ("~80MB", "→ Web-based visualization"),
+        "altair": ("~30MB", "→ Declarative visualization"),
+    }),
+    "3_nlp": MappingProxyType({
+        "transformers": ("~5GB", "→ State-of-the-art NLP models"),
+        "spacy": ("~1GB", "→ Industrial-strength NLP"),
+        "nltk": ("~500MB", "→ Natural Language Toolkit"),
+        "gensim": ("~200MB", "→ Topic modeling & document similarity"),
+        "sentence-transformers": ("~1GB", "→ Text embeddings & similarity"),
+    }),
+})
+
+_CATEGORY_HEADINGS: Mapping[str, str] = MappingProxyType({
+    "1_core_frameworks": "Machine Learning & Deep Learning Libraries:",
+    "2_visualization": "Data Visualization Tools:",
+    "3_nlp": "Natural Language Processing Tools:",
+})
+
 class MLLibraryManager:
-    def __init__(self):
+    def __init__(self, installer: str = "auto"):
         """
         🔵 Initialize Manager:
-        - Creates directory structure
-        - Defines library categories and sizes
-        - Sets up logging system
+        - Precomputes sizes and menus from the shared library table
+        - Picks the installer backend ("auto" prefers uv when on PATH)
+        - Chooses the log file (created on the first install, so
+          menu-only sessions touch nothing on disk)
         
         🟡 Example Structure:
         ml_libraries/
         ├── logs/
         │   └── installation_20240105.log
+        ├── pip_cache/
+        ├── cache/
+        │   └── resolutions/<sha256>.json
         └── requirements/
+            ├── 1_core_frameworks-linux-x86_64-py3.11.lock
             └── installed_packages.txt
         """
         self.base_dir = "ml_libraries"
-        self.libraries = {
-            "1_core_frameworks": {
-                "tensorflow": "~2GB",    # 🟢 Deep Learning & ML
-                "torch": "~4GB",         # 🟢 PyTorch for Deep Learning
-                "scikit-learn": "~300MB",# 🟢 Traditional ML
-                "keras": "~100MB",       # 🟢 High-level Neural Networks
-                "jax": "~600MB",         # 🟢 Numerical Computing
-                "xgboost": "~200MB",     # 🟢 Gradient Boosting
-            },
-            "2_visualization": {
-                "matplotlib": "~50MB",    # 🟣 Basic Plotting
-                "plotly": "~100MB",       # 🟣 Interactive Viz
-                "seaborn": "~20MB",       # 🟣 Statistical Viz
-                "bokeh": "~80MB",         # 🟣 Web-based Viz
-                "altair": "~30MB",        # 🟣 Declarative Viz
-            },
-            "3_nlp": {
-                "transformers": "~5GB",    # 🟡 Hugging Face Models
-                "spacy": "~1GB",           # 🟡 NLP Processing
-                "nltk": "~500MB",          # 🟡 Text Processing
-                "gensim": "~200MB",        # 🟡 Topic Modeling
-                "sentence-transformers": "~1GB", # 🟡 Text Embeddings
-            }
-        }
-        self.setup_logging()
+        self.cache_dir = os.path.join(self.base_dir, "pip_cache")
+        # main() rejects --installer uv when uv is missing
+        self._installer = None if installer == "pip" else shutil.which("uv")
+        self._pip_fetch_flags = _pip_fetch_flags()
+        self.libraries = _LIBRARIES
+        self.category_headings = _CATEGORY_HEADINGS
+        # Category keys in menu order, and menu number -> key ("1" -> "1_core_frameworks")
+        self._cat_keys = tuple(self.libraries)
+        self._cat_by_index = {str(i): category for i, category in enumerate(self._cat_keys, 1)}
+        # Sizes parsed once: name -> MB, and each category's MB tuple
+        self._size_mb = {lib: _parse_mb(size)
+                         for libs in self.libraries.values()
+                         for lib, (size, _) in libs.items()}
+        self._category_mb = {category: tuple(self._size_mb[lib] for lib in libs)
+                             for category, libs in self.libraries.items()}
+        # Menus are constant, so format them once and write each in one call
+        self._menu_text = {category: self._format_library_menu(category)
+                           for category in self._cat_keys}
+        self._main_menu_text = "\n".join([
+            "\n" + "="*50,
+            "ML Library Installation Manager",
+            "="*50,
+            "Available Options:",
+            "\n1. Install All Libraries (~15GB total)",
+            "   → Complete setup for ML development",
+            "   → Includes all frameworks, visualization, and NLP tools",
+            "   → Best for full development environments",
+            "\n2. Install by Category",
+            "   → Choose specific domains (ML, Visualization, NLP)",
+            "   → Optimized for different use cases:",
+            "     • ML/AI Development: Core Frameworks",
+            "     • Data Analysis: Visualization",
+            "     • Text Processing: NLP",
+            "\n3. Install Individual Libraries",
+            "   → Pick specific libraries you need",
+            "   → Save space by selecting only required tools",
+            "   → Custom installation for specific projects",
+            "\n0. Exit",
+            "="*50,
+        ]) + "\n"
+        self._categories_text = "\n".join([
+            "\nAvailable Categories:",
+            "\n1. Core Frameworks (~7.2GB)",
+            "   → Machine Learning & Deep Learning",
+            "   • TensorFlow: Neural Networks, Deep Learning",
+            "   • PyTorch: Research, Deep Learning",
+            "   • Scikit-learn: Traditional ML, Data Mining",
+            "   Best for: AI Development, Model Training",
+            "\n2. Visualization (~280MB)",
+            "   → Data Visualization & Analysis",
+            "   • Matplotlib: Static Plots",
+            "   • Plotly: Interactive Dashboards",
+            "   • Seaborn: Statistical Visualization",
+            "   Best for: Data Analysis, Reporting",
+            "\n3. NLP (~7.7GB)",
+            "   → Natural Language Processing",
+            "   • Transformers: Language Models, BERT",
+            "   • SpaCy: Text Processing, Named Entities",
+            "   • NLTK: Text Analysis, Linguistics",
+            "   Best for: Text Analysis, Language Processing",
+            "\n0. Back to main menu",
+        ]) + "\n"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._log_file_path = os.path.join(self.base_dir, "logs", f"installation_{timestamp}.log")
+        self._logging_ready = False
 
     def setup_logging(self):
         """
@@ -80,152 +321,319 @@ class MLLibraryManager:
         - Creates timestamped log files
         - Records all installations
         - Tracks errors and successes
+        - Runs once, from the first install_libraries call
         
         🟡 Log Example:
         2024-01-05 14:30:22 - INFO - Installing tensorflow...
         2024-01-05 14:35:45 - SUCCESS - tensorflow installed
         """
-        log_dir = os.path.join(self.base_dir, "logs")
-        os.makedirs(log_dir, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = os.path.join(log_dir, f"installation_{timestamp}.log")
+        if self._logging_ready:
+            return
+        os.makedirs(os.path.dirname(self._log_file_path), exist_ok=True)
         
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_file),
+                logging.FileHandler(self._log_file_path),
                 logging.StreamHandler(sys.stdout)
             ]
         )
+        self._logging_ready = True
 
     def display_menu(self):
         """Main menu display with descriptions"""
-        print("\n" + "="*50)
-        print("ML Library Installation Manager")
-        print("="*50)
-        print("Available Options:")
-        print("\n1. Install All Libraries (~15GB total)")
-        print("   → Complete setup for ML development")
-        print("   → Includes all frameworks, visualization, and NLP tools")
-        print("   → Best for full development environments")
-        print("\n2. Install by Category")
-        print("   → Choose specific domains (ML, Visualization, NLP)")
-        print("   → Optimized for different use cases:")
-        print("     • ML/AI Development: Core Frameworks")
-        print("     • Data Analysis: Visualization")
-        print("     • Text Processing: NLP")
-        print("\n3. Install Individual Libraries")
-        print("   → Pick specific libraries you need")
-        print("   → Save space by selecting only required tools")
-        print("   → Custom installation for specific projects")
-        print("\n0. Exit")
-        print("="*50)
+        sys.stdout.write(self._main_menu_text)
 
     def display_categories(self):
         """Category display with use cases"""
-        print("\nAvailable Categories:")
-        print("\n1. Core Frameworks (~7.2GB)")
-        print("   → Machine Learning & Deep Learning")
-        print("   • TensorFlow: Neural Networks, Deep Learning")
-        print("   • PyTorch: Research, Deep Learning")
-        print("   • Scikit-learn: Traditional ML, Data Mining")
-        print("   Best for: AI Development, Model Training")
-        
-        print("\n2. Visualization (~280MB)")
-        print("   → Data Visualization & Analysis")
-        print("   • Matplotlib: Static Plots")
-        print("   • Plotly: Interactive Dashboards")
-        print("   • Seaborn: Statistical Visualization")
-        print("   Best for: Data Analysis, Reporting")
-        
-        print("\n3. NLP (~7.7GB)")
-        print("   → Natural Language Processing")
-        print("   • Transformers: Language Models, BERT")
-        print("   • SpaCy: Text Processing, Named Entities")
-        print("   • NLTK: Text Analysis, Linguistics")
-        print("   Best for: Text Analysis, Language Processing")
-        
-        print("\n0. Back to main menu")
+        sys.stdout.write(self._categories_text)
+
+    def _format_library_menu(self, category: str) -> str:
+        """Build the numbered library listing for a category."""
+        category_name = category[2:].replace('_', ' ').title()
+        lines = [f"\nLibraries in {category_name}:", f"\n{self.category_headings[category]}"]
+        for i, (lib, (size, desc)) in enumerate(self.libraries[category].items(), 1):
+            lines.append(f"{i}. {lib} ({size})\n   {desc}")
+        lines.append("\n0. Back to categories")
+        return "\n".join(lines) + "\n"
 
     def display_libraries(self, category):
         """Library display with descriptions"""
-        libs = list(self.libraries[category].items())
-        category_name = category[2:].replace('_', ' ').title()
-        
-        print(f"\nLibraries in {category_name}:")
-        if category.startswith("1_"):  # Core Frameworks
-            print("\nMachine Learning & Deep Learning Libraries:")
-            for i, (lib, size) in enumerate(libs, 1):
-                desc = {
-                    "tensorflow": "→ Google's deep learning framework",
-                    "torch": "→ Facebook's PyTorch for research & production",
-                    "scikit-learn": "→ Traditional ML algorithms & tools",
-                    "keras": "→ High-level neural network API",
-                    "jax": "→ Automatic differentiation & XLA",
-                    "xgboost": "→ Gradient boosting framework"
-                }.get(lib, "")
-                print(f"{i}. {lib} ({size})\n   {desc}")
-                
-        elif category.startswith("2_"):  # Visualization
-            print("\nData Visualization Tools:")
-            for i, (lib, size) in enumerate(libs, 1):
-                desc = {
-                    "matplotlib": "→ Basic plotting library",
-                    "plotly": "→ Interactive visualization",
-                    "seaborn": "→ Statistical data visualization",
-                    "bokeh": "→ Web-based visualization",
-                    "altair": "→ Declarative visualization"
-                }.get(lib, "")
-                print(f"{i}. {lib} ({size})\n   {desc}")
-                
-        elif category.startswith("3_"):  # NLP
-            print("\nNatural Language Processing Tools:")
-            for i, (lib, size) in enumerate(libs, 1):
-                desc = {
-                    "transformers": "→ State-of-the-art NLP models",
-                    "spacy": "→ Industrial-strength NLP",
-                    "nltk": "→ Natural Language Toolkit",
-                    "gensim": "→ Topic modeling & document similarity",
-                    "sentence-transformers": "→ Text embeddings & similarity"
-                }.get(lib, "")
-                print(f"{i}. {lib} ({size})\n   {desc}")
-        
-        print("\n0. Back to categories")
-        return libs
+        sys.stdout.write(self._menu_text[category])
+        return list(self.libraries[category].items())
+
+    def list_libraries(self, names_only: bool = False):
+        """Non-interactive listing of every category and library."""
+        for category in self._cat_keys:
+            if names_only:
+                print("\n".join(self.libraries[category]))
+                continue
+            print(f"\n{category} ({self.calculate_category_size(category)})")
+            for lib, (size, desc) in self.libraries[category].items():
+                print(f"   {lib} ({size}) {desc}")
+
+    def all_libraries(self) -> Set[str]:
+        """Every library across all categories."""
+        return set(self._size_mb)
 
     def calculate_category_size(self, category: str) -> str:
         """Calculate total size for a category."""
-        return self.calculate_size(set(self.libraries[category].keys()))
+        return _category_size(self._category_mb[category])
 
     def calculate_size(self, libraries: Set[str]) -> str:
         """Calculate total size for selected libraries."""
-        total_mb = 0
-        for category in self.libraries.values():
-            for lib, size in category.items():
-                if lib in libraries:
-                    size_str = size.lower()
-                    if 'gb' in size_str:
-                        mb = float(size_str.replace('~', '').replace('gb', '')) * 1024
-                    else:
-                        mb = float(size_str.replace('~', '').replace('mb', ''))
-                    total_mb += mb
-        
-        if total_mb > 1024:
-            return f"~{total_mb/1024:.1f}GB"
-        return f"~{total_mb:.0f}MB"
+        return _format_mb(sum(self._size_mb.get(lib, 0) for lib in libraries))
+
+    def pip_command(self, allow_uv: bool = True) -> List[str]:
+        """
+        Base wheel-only install command, sharing one persistent cache.
+        Uses `uv pip install` against this interpreter when available,
+        otherwise `python -m pip install`.
+        """
+        if allow_uv and self._installer is not None:
+            return [self._installer, "pip", "install", "--python", sys.executable,
+                    "--cache-dir", self.cache_dir, *UV_BINARY_ONLY_FLAGS]
+        return [sys.executable, "-m", "pip", "install",
+                "--cache-dir", self.cache_dir, *BINARY_ONLY_FLAGS, *self._pip_fetch_flags]
+
+    def download_command(self) -> List[str]:
+        """pip download counterpart of pip_command(), sharing the same cache and wheel-only flags."""
+        return [sys.executable, "-m", "pip", "download",
+                "--cache-dir", self.cache_dir, *BINARY_ONLY_FLAGS, *self._pip_fetch_flags]
+
+    def lock_path(self, category: str) -> str:
+        """
+        Path of the pinned, hashed requirements lock for a category. Wheel
+        hashes differ per platform and Python version, so each gets its own lock.
+        """
+        return os.path.join(self.base_dir, "requirements", f"{category}-{_environment_tag()}.lock")
+
+    def lock_applies(self, category: str) -> bool:
+        """
+        Whether the category lock can be installed as is: it pins every
+        dependency, so it is only used when none of its packages are installed
+        and it cannot override versions other packages rely on.
+        """
+        try:
+            with open(self.lock_path(category)) as f:
+                pinned = [line.split("==", 1)[0] for line in f if "==" in line]
+        except OSError:
+            return False
+        return not any(_already_installed(name) for name in pinned)
+
+    def resolve(self, selected: Set[str], ignore_installed: bool = False) -> List[dict]:
+        """
+        Dependency resolution for a selection, from pip's JSON dry-run report.
+        By default it lists only what pip would install into the current
+        environment, keeping installed packages (and their constraints) as is;
+        ignore_installed=True gives the full tree, as needed for a lock.
+        """
+        # uv has no --report, so resolution always uses pip
+        flags = ["--ignore-installed"] if ignore_installed else []
+        result = _run_pip(
+            self.pip_command(allow_uv=False),
+            ["--dry-run", *flags, "--quiet", "--report", "-", *sorted(selected)],
+            capture_output=True
+        )
+        result.check_returncode()
+        return json.loads(result.stdout)["install"]
+
+    def write_lock(self, category: str, resolved: List[dict]):
+        """
+        🔵 Lock Generation:
+        - Takes the category's resolution from resolve()
+        - Pins every resolved distribution with its sha256 hash
+        - Later installs skip resolution via --require-hashes
+
+        🟡 Lock Example:
+        numpy==1.26.4 --hash=sha256:2a02aba9...
+        """
+        lines = []
+        for item in resolved:
+            archive_info = item["download_info"].get("archive_info", {})
+            sha256 = archive_info.get("hashes", {}).get("sha256")
+            if sha256 is None and archive_info.get("hash", "").startswith("sha256="):
+                sha256 = archive_info["hash"][len("sha256="):]
+            if sha256 is None:
+                # --require-hashes rejects unhashed entries, so don't write a partial lock
+                raise ValueError(f"no sha256 hash reported for {item['metadata']['name']}")
+            lines.append(f"{item['metadata']['name']}=={item['metadata']['version']} --hash=sha256:{sha256}")
+
+        _write_atomic(self.lock_path(category), "\n".join(lines) + "\n")
+
+    def _resolution_path(self, key: str) -> str:
+        # One file per entry: concurrent runs never rewrite each other's entries
+        return os.path.join(self.base_dir, "cache", "resolutions", f"{key}.json")
+
+    def resolution_key(self, selected: Set[str]) -> str:
+        """Cache key for a selection in this exact interpreter and environment."""
+        return _resolution_key(selected, "uv" if self._installer else "pip")
+
+    def cached_resolution(self, key: str) -> Optional[List[str]]:
+        """Pins from an earlier resolution, or None if missing or older than RESOLUTION_MAX_AGE."""
+        try:
+            with open(self._resolution_path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("created", 0) < time.time() - RESOLUTION_MAX_AGE:
+            return None
+        return entry["requirements"]
+
+    def record_resolution(self, key: str, resolved: List[dict]):
+        """
+        🔵 Resolution Cache:
+        - Takes the resolution that was just installed (no second resolve)
+        - Stores its pins in cache/resolutions/<key>.json
+        """
+        _write_atomic(self._resolution_path(key),
+                      json.dumps({"created": time.time(), "requirements": _pins(resolved)}, indent=2))
+
+    def ensure_lock(self, category: str):
+        """Write the category lock from a full (ignore-installed) resolution if it is missing."""
+        if os.path.exists(self.lock_path(category)):
+            return
+        try:
+            self.write_lock(category, self.resolve(set(self.libraries[category]), ignore_installed=True))
+        except (subprocess.CalledProcessError, ValueError, KeyError) as e:
+            logging.warning(f"Could not write lock for {category[2:]}: {str(e)}")
 
-    def install_libraries(self, selected: Set[str]):
-        """Install selected libraries using pip."""
-        for lib in selected:
+    def manifest_path(self) -> str:
+        """Path of the name==version record of libraries installed by this tool."""
+        return os.path.join(self.base_dir, "requirements", "installed_packages.txt")
+
+    def install_libraries(self, selected: Set[str], sequential: bool = False,
+                          category: Optional[str] = None) -> List[str]:
+        """
+        Install selected libraries using pip.
+        Returns the libraries that could not be installed.
+
+        🔵 Manifest:
+        - Libraries that are already installed are skipped without a pip call
+        - Newly installed libraries are appended to installed_packages.txt
+        """
+        already = {lib for lib in selected if _already_installed(lib)}
+        if already:
+            # Printed, not logged: a run with nothing to install creates no log file
+            print(f"Already installed, skipping: {', '.join(sorted(already))}")
+        selected = set(selected) - already
+        if not selected:
+            return []
+
+        self.setup_logging()
+        # Skip pip's own PyPI self-version check on every invocation
+        os.environ.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+        if already:
+            # A partial category must not produce (or be served from) the category lock
+            category = None
+
+        failed = self._install_selected(selected, sequential, category)
+
+        installed = sorted(lib for lib in selected if _already_installed(lib))
+        if installed:
+            os.makedirs(os.path.dirname(self.manifest_path()), exist_ok=True)
+            with open(self.manifest_path(), "a") as f:
+                f.writelines(f"{lib}=={version(lib)}\n" for lib in installed)
+        return failed
+
+    def _install_selected(self, selected: Set[str], sequential: bool,
+                          category: Optional[str]) -> List[str]:
+        """
+        🔵 Strategy (returns the libraries that failed):
+        - A category with a lock file installs straight from the lock, when
+          none of the lock's packages are installed yet
+        - A selection already resolved in this exact environment installs
+          its pins with --no-deps
+        - Otherwise one dry-run resolution against the current environment,
+          whose pins are installed in one batched --no-deps call and saved
+        - If the batch fails, wheels are downloaded in parallel (pip backend;
+          uv already downloads in parallel) and libraries install one at a time
+        - sequential=True skips batch and parallel download (for build-order issues)
+        """
+        if category is not None and self.lock_applies(category):
             try:
-                print(f"\nInstalling {lib}...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", lib])
-                print(f"Successfully installed {lib}")
+                logging.info(f"Installing {category[2:]} from {self.lock_path(category)}...")
+                _run_pip(self.pip_command(),
+                         ["--require-hashes", "-r", self.lock_path(category)]).check_returncode()
+                logging.info(f"Successfully installed {category[2:]}")
+                return []
             except subprocess.CalledProcessError as e:
-                print(f"Error installing {lib}: {str(e)}")
-            except Exception as e:
-                print(f"Unexpected error installing {lib}: {str(e)}")
+                logging.warning(f"Lock install failed ({str(e)}), resolving from scratch")
+                # Drop the stale lock so ensure_lock() writes a fresh one after this install
+                try:
+                    os.remove(self.lock_path(category))
+                except FileNotFoundError:
+                    pass
+
+        # Taken before installing: the key describes the environment the pins were resolved in
+        key = self.resolution_key(selected)
+        pinned = self.cached_resolution(key)
+        if pinned is not None:
+            try:
+                logging.info(f"Installing {', '.join(sorted(selected))} from cached resolution...")
+                _run_pip(self.pip_command(), ["--no-deps", *pinned]).check_returncode()
+                logging.info(f"Successfully installed {', '.join(sorted(selected))}")
+                return []
+            except subprocess.CalledProcessError as e:
+                logging.warning(f"Cached resolution install failed ({str(e)}), resolving from scratch")
+
+        if not sequential:
+            libs = sorted(selected)
+            try:
+                resolved = self.resolve(selected)
+            except (subprocess.CalledProcessError, ValueError, KeyError) as e:
+                logging.warning(f"Could not resolve {', '.join(libs)} ({str(e)}), "
+                                f"installing without saving the resolution")
+                resolved = None
+            try:
+                logging.info(f"Installing {', '.join(libs)}...")
+                args = libs if resolved is None else ["--no-deps", *_pins(resolved)]
+                _run_pip(self.pip_command(), args).check_returncode()
+                logging.info(f"Successfully installed {', '.join(libs)}")
+                if resolved is not None:
+                    self.record_resolution(key, resolved)
+                if category is not None:
+                    self.ensure_lock(category)
+                return []
+            except subprocess.CalledProcessError as e:
+                logging.warning(f"Batch install failed ({str(e)}), retrying one library at a time")
+
+        libs = sorted(selected)
+        failed = []
+        wheel_dir = tempfile.mkdtemp(prefix="pylibpro-wheels-")
+        try:
+            find_links = []
+            if not sequential and len(libs) > 1 and self._installer is None:
+                try:
+                    logging.info(f"Downloading {len(libs)} libraries in parallel...")
+                    download = partial(_download_one, download_command=self.download_command(),
+                                       wheel_dir=wheel_dir)
+                    with multiprocessing.Pool(processes=min(8, len(libs))) as pool:
+                        results = pool.map(download, libs)
+                    for lib, returncode, stderr in results:
+                        if returncode != 0:
+                            logging.warning(f"Error downloading {lib}, will fetch during install:\n{stderr.strip()}")
+                        else:
+                            find_links += ["--find-links", os.path.join(wheel_dir, lib)]
+                except Exception as e:
+                    logging.warning(f"Parallel download failed ({str(e)}), installing without prefetch")
+
+            # Installs stay serial: parallel pip installs race on shared dependencies
+            for lib in libs:
+                try:
+                    logging.info(f"Installing {lib}...")
+                    _run_pip(self.pip_command(), [*find_links, lib]).check_returncode()
+                    logging.info(f"Successfully installed {lib}")
+                except subprocess.CalledProcessError as e:
+                    logging.error(f"Error installing {lib}: {str(e)}")
+                    failed.append(lib)
+                except Exception as e:
+                    logging.error(f"Unexpected error installing {lib}: {str(e)}")
+                    failed.append(lib)
+        finally:
+            shutil.rmtree(wheel_dir, ignore_errors=True)
+        return failed
 
     def run(self):
         """
@@ -247,9 +655,7 @@ class MLLibraryManager:
 
             elif choice == "1":
                 # Install all libraries
-                all_libs = set()
-                for category in self.libraries.values():
-                    all_libs.update(category.keys())
+                all_libs = self.all_libraries()
                 total_size = self.calculate_size(all_libs)
                 if input(f"\nInstall all libraries? Total size: {total_size} (y/n): ").lower() == 'y':
                     self.install_libraries(all_libs)
@@ -261,11 +667,11 @@ class MLLibraryManager:
                     cat_choice = input("\nSelect category (0-3): ")
                     if cat_choice == "0":
                         break
-                    category = f"{cat_choice}_" + list(self.libraries.keys())[int(cat_choice)-1][2:]
-                    if category in self.libraries:
+                    category = self._cat_by_index.get(cat_choice)
+                    if category is not None:
                         size = self.calculate_category_size(category)
                         if input(f"\nInstall {category[2:]}? Size: {size} (y/n): ").lower() == 'y':
-                            self.install_libraries(set(self.libraries[category].keys()))
+                            self.install_libraries(set(self.libraries[category].keys()), category=category)
 
             elif choice == "3":
                 # Install individual libraries
@@ -274,8 +680,8 @@ class MLLibraryManager:
                     cat_choice = input("\nSelect category (0-3): ")
                     if cat_choice == "0":
                         break
-                    category = f"{cat_choice}_" + list(self.libraries.keys())[int(cat_choice)-1][2:]
-                    if category in self.libraries:
+                    category = self._cat_by_index.get(cat_choice)
+                    if category is not None:
                         while True:
                             libs = self.display_libraries(category)
                             lib_choice = input("\nSelect library (0 to go back): ")
@@ -285,7 +691,7 @@ class MLLibraryManager:
                                 idx = int(lib_choice) - 1
                                 if 0 <= idx < len(libs):
                                     lib_name = libs[idx][0]
-                                    if input(f"\nInstall {lib_name}? Size: {libs[idx][1]} (y/n): ").lower() == 'y':
+                                    if input(f"\nInstall {lib_name}? Size: {libs[idx][1][0]} (y/n): ").lower() == 'y':
                                         self.install_libraries({lib_name})
                             except ValueError:
                                 print("Invalid input")
@@ -314,14 +720,64 @@ def main():
        python lib-collect.py
        > Choose option 3
        > Select specific libraries
+
+    5. Scripted / CI Setup (no prompts):
+       python lib-collect.py install --category 1_core_frameworks
+       python lib-collect.py install --all
+       python lib-collect.py list --names | xargs -P 4 -n 1 python lib-collect.py install --libs
     """
+    parser = argparse.ArgumentParser(description="ML Library Collection Manager")
+    parser.add_argument("--installer", choices=["auto", "pip", "uv"], default="auto",
+                        help="install backend (auto uses uv when it is on PATH)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    list_parser = subparsers.add_parser("list", help="show library categories and sizes")
+    list_parser.add_argument("--names", action="store_true",
+                             help="print bare library names, one per line")
+
+    install_parser = subparsers.add_parser("install", help="install libraries without prompts")
+    target = install_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--all", action="store_true", help="install every library")
+    target.add_argument("--category", help="install one category, e.g. 1_core_frameworks")
+    target.add_argument("--libs", nargs="+", metavar="LIB", help="install specific libraries")
+    target.add_argument("--interactive", action="store_true", help="open the interactive menu")
+    install_parser.add_argument("--sequential", action="store_true",
+                                help="install one library at a time (for build-order issues)")
+    args = parser.parse_args()
+    if args.installer == "uv" and shutil.which("uv") is None:
+        parser.error("--installer uv requested but 'uv' was not found on PATH")
+
+    failed = []
     try:
-        manager = MLLibraryManager()
-        manager.run()
+        manager = MLLibraryManager(installer=args.installer)
+        if args.command == "list":
+            manager.list_libraries(names_only=args.names)
+        elif args.command == "install" and not args.interactive:
+            if args.all:
+                failed = manager.install_libraries(manager.all_libraries(), sequential=args.sequential)
+            elif args.category is not None:
+                if args.category not in manager.libraries:
+                    parser.error(f"unknown category {args.category!r} "
+                                 f"(choose from {', '.join(manager.libraries)})")
+                failed = manager.install_libraries(set(manager.libraries[args.category]),
+                                                   sequential=args.sequential,
+                                                   category=args.category)
+            else:
+                failed = manager.install_libraries(set(args.libs), sequential=args.sequential)
+        else:
+            manager.run()
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
+        # Conventional SIGINT status, so a cancelled scripted run isn't read as success
+        sys.exit(130)
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
+        sys.exit(1)
+
+    # Non-zero exit so CI jobs and xargs pipelines see failed installs
+    if failed:
+        print(f"Failed to install: {', '.join(failed)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -8,23 +9,22 @@ def install_requirements():
     """Install required packages for PyLibPro"""
     print("Setting up PyLibPro...")
     
-    requirements = [
-        'colorama',    # Terminal colors
-        'logging',     # Logging functionality
-    ]
-    
-    for package in requirements:
+    # Only third-party packages belong here (logging is in the stdlib);
+    # anything already importable is skipped so no pip call is made
+    needed = [p for p in ('colorama',) if importlib.util.find_spec(p) is None]
+
+    if needed:
         try:
-            print(f"\nInstalling {package}...")
+            print(f"\nInstalling {', '.join(needed)}...")
             subprocess.check_call([
                 sys.executable, 
                 "-m", 
                 "pip", 
                 "install", 
-                package
+                *needed
             ])
         except Exception as e:
-            print(f"Error installing {package}: {e}")
+            print(f"Error installing {', '.join(needed)}: {e}")
             
     print("\nSetup complete! Run 'python lib-collect.py' to start")
 